@@ -1,6 +1,9 @@
 from django.contrib import admin
-from django.utils.html import format_html
+from django.db.models import Count, Q
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
 from .models import (
+    DeliveryStatus,
     EventType,
     NotificationPreference,
     UserEventPreference,
@@ -9,6 +12,15 @@ from .models import (
     NotificationTemplate,
 )
 
+_STATUS_COLORS = {
+    "sent": "green",
+    "failed": "red",
+    "pending": "orange",
+    "retrying": "blue",
+}
+
+MAX_DISPLAYED_EVENT_PREFERENCES = 50
+
 
 @admin.register(EventType)
 class EventTypeAdmin(admin.ModelAdmin):
@@ -56,9 +68,19 @@ class NotificationPreferenceAdmin(admin.ModelAdmin):
     search_fields = ["user__username", "user__email"]
     readonly_fields = ["created_at", "updated_at", "display_event_preferences"]
 
+    def get_queryset(self, request):
+        # Event preferences only appear on the change form, which loads its
+        # own; prefetching them would load every listed user's rows
+        return super().get_queryset(request).select_related("user")
+
     def display_event_preferences(self, obj):
-        prefs = obj.user.event_preferences.all()
-        if not prefs.exists():
+        # The cap is applied in the query, with the event types joined in
+        prefs = list(
+            obj.user.event_preferences.select_related("event_type")[
+                :MAX_DISPLAYED_EVENT_PREFERENCES
+            ]
+        )
+        if not prefs:
             return "No event preferences set."
 
         return format_html(
@@ -76,7 +98,9 @@ class NotificationPreferenceAdmin(admin.ModelAdmin):
     display_event_preferences.short_description = "User Event Preferences"
 
 
-admin.site.register(UserEventPreference)
+@admin.register(UserEventPreference)
+class UserEventPreferenceAdmin(admin.ModelAdmin):
+    list_select_related = ["user", "event_type"]
 
 
 class NotificationDeliveryInline(admin.TabularInline):
@@ -105,30 +129,52 @@ class NotificationAdmin(admin.ModelAdmin):
     search_fields = ["user__username", "title", "message"]
     readonly_fields = ["created_at", "updated_at", "read_at"]
     inlines = [NotificationDeliveryInline]
+    list_select_related = ["user", "event_type"]
+
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                n_sent=Count(
+                    "deliveries", filter=Q(deliveries__status=DeliveryStatus.SENT)
+                ),
+                n_failed=Count(
+                    "deliveries", filter=Q(deliveries__status=DeliveryStatus.FAILED)
+                ),
+                n_pending=Count(
+                    "deliveries", filter=Q(deliveries__status=DeliveryStatus.PENDING)
+                ),
+                n_retrying=Count(
+                    "deliveries",
+                    filter=Q(deliveries__status=DeliveryStatus.RETRYING),
+                ),
+            )
+        )
 
     def delivery_status(self, obj):
         """Show delivery status summary"""
-        deliveries = obj.deliveries.all()
-        if not deliveries:
-            return format_html('<span style="color: orange;">No deliveries</span>')
-
-        status_counts = {}
-        for delivery in deliveries:
-            status_counts[delivery.status] = status_counts.get(delivery.status, 0) + 1
-
-        status_html = []
-        for status, count in status_counts.items():
-            color = {
-                "sent": "green",
-                "failed": "red",
-                "pending": "orange",
-                "retrying": "blue",
-            }.get(status, "black")
-            status_html.append(
-                f'<span style="color: {color};">{status}: {count}</span>'
+        status_counts = {
+            status: count
+            for status, count in (
+                ("sent", obj.n_sent),
+                ("failed", obj.n_failed),
+                ("pending", obj.n_pending),
+                ("retrying", obj.n_retrying),
             )
-
-        return format_html(" | ".join(status_html))
+            if count
+        }
+        if not status_counts:
+            return mark_safe('<span style="color: orange;">No deliveries</span>')
+
+        return format_html_join(
+            mark_safe(" | "),
+            '<span style="color: {};">{}: {}</span>',
+            (
+                (_STATUS_COLORS.get(status, "black"), status, count)
+                for status, count in status_counts.items()
+            ),
+        )
 
     delivery_status.short_description = "Delivery Status"
 
@@ -145,6 +191,7 @@ class NotificationDeliveryAdmin(admin.ModelAdmin):
     ]
     list_filter = ["channel", "status", "attempted_at", "delivered_at"]
     search_fields = ["notification__title", "notification__user__username"]
+    list_select_related = ["notification__user"]
     readonly_fields = [
         "attempted_at",
         "delivered_at",
@@ -159,4 +206,5 @@ class NotificationTemplateAdmin(admin.ModelAdmin):
     list_display = ["event_type", "channel", "is_active", "created_at"]
     list_filter = ["channel", "is_active", "created_at"]
     search_fields = ["event_type__name", "title_template"]
+    list_select_related = ["event_type"]
     readonly_fields = ["created_at", "updated_at"]
@@ -1,5 +1,6 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List
 from django.core.mail import send_mail
 from django.conf import settings
 import logging
@@ -13,6 +14,9 @@ class NotificationBackend(ABC):
     Abstract base class for notification backends
     """
 
+    # Upper bound on sends in flight at once in send_notifications
+    max_concurrency = 10
+
     @abstractmethod
     def send_notification(self, notification) -> bool:
         """
@@ -20,6 +24,22 @@ class NotificationBackend(ABC):
         """
         pass
 
+    def send_notifications(self, notifications) -> List[bool]:
+        """
+        Send a batch of notifications concurrently and return their success
+        statuses in order. Notifications should have their user preloaded
+        """
+        return asyncio.run(self._send_batch(notifications))
+
+    async def _send_batch(self, notifications) -> List[bool]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def send(notification):
+            async with semaphore:
+                return await asyncio.to_thread(self.send_notification, notification)
+
+        return await asyncio.gather(*(send(n) for n in notifications))
+
 
 class InAppBackend(NotificationBackend):
     """
@@ -32,10 +52,18 @@ class InAppBackend(NotificationBackend):
         """
 
         logger.info(
-            f"In-app notification {notification.id} send success for user {notification.user.username}"
+            "In-app notification %s send success for user %s",
+            notification.id,
+            notification.user.username,
         )
         return True
 
+    def send_notifications(self, notifications) -> List[bool]:
+        """
+        Nothing goes over the network for in-app notifications
+        """
+        return [self.send_notification(n) for n in notifications]
+
 
 class EmailBackend(NotificationBackend):
     """
@@ -49,9 +77,6 @@ class EmailBackend(NotificationBackend):
         try:
             # In a real implementation, you'd use Django's email system
             # For now, we'll just log it
-            logger.info(f"[MOCK EMAIL] To: {notification.user.email}")
-            logger.info(f"[MOCK EMAIL] Subject: {notification.title}")
-            logger.info(f"[MOCK EMAIL] Body: {notification.message}")
 
             # Simulate email sending
             # send_mail(
@@ -62,12 +87,16 @@ class EmailBackend(NotificationBackend):
             #     fail_silently=False,
             # )
             logger.info(
-                f"Email sent success {notification.user.email} for notification {notification.id}"
+                "[MOCK EMAIL] Sent notification %s to=%s subject=%s body=%s",
+                notification.id,
+                notification.user.email,
+                notification.title,
+                notification.message,
             )
             return True
 
         except Exception as e:
-            logger.error(f"Failed to send email notification: {e}")
+            logger.error("Failed to send email notification: %s", e)
             return False
 
 
@@ -84,15 +113,10 @@ class SMSBackend(NotificationBackend):
             phone = getattr(notification.user, "phone_number", None)
 
             if not phone:
-                logger.warning(f"No phone number for user {notification.user.id}")
+                logger.warning("No phone number for user %s", notification.user.id)
                 return False
 
             # Mock SMS sending - in production, you'd use Twilio, AWS SNS, etc.
-            logger.info(f"[MOCK SMS] To: {phone}")
-            logger.info(f"[MOCK SMS] Message: {notification.title}")
-            logger.info(
-                f"[MOCK SMS] Body: {notification.message[:160]}..."
-            )  # SMS character limit
 
             # Simulate SMS sending with external service
             # import twilio
@@ -102,26 +126,38 @@ class SMSBackend(NotificationBackend):
             #     from_='+1234567890',
             #     to=phone
             # )
-            logger.info(f"SMS sent success {phone} for notification {notification.id}")
+            logger.info(
+                "[MOCK SMS] Sent notification %s to=%s title=%s body=%.160s",
+                notification.id,
+                phone,
+                notification.title,
+                notification.message,
+            )  # SMS character limit
             return True
 
         except Exception as e:
-            logger.error(f"Failed to send SMS notification: {e}")
+            logger.error("Failed to send SMS notification: %s", e)
             return False
 
 
+_IN_APP, _EMAIL, _SMS = (
+    NotificationChannel.IN_APP.value,
+    NotificationChannel.EMAIL.value,
+    NotificationChannel.SMS.value,
+)
+
+_BACKENDS = {
+    _IN_APP: InAppBackend(),
+    _EMAIL: EmailBackend(),
+    _SMS: SMSBackend(),
+}
+
+
 def get_notification_backend(channel: str) -> NotificationBackend:
     """
     Factory function to get the appropriate notification backend
     """
-    backends = {
-        NotificationChannel.IN_APP: InAppBackend(),
-        NotificationChannel.EMAIL: EmailBackend(),
-        NotificationChannel.SMS: SMSBackend(),
-    }
-
-    backend = backends.get(channel)
-    if not backend:
+    try:
+        return _BACKENDS[channel]
+    except KeyError:
         raise ValueError(f"Unknown notification channel: {channel}")
-
-    return backend
@@ -0,0 +1,88 @@
+from django.core.cache import cache
+from .models import EventType, NotificationPreference, NotificationTemplate
+
+# Event types and templates change rarely; keep them in Django's cache and
+# drop the entries from signals whenever they are edited
+CACHE_TIMEOUT = 300
+
+_ACTIVE_EVENT_TYPES_KEY = "event_types:active"
+
+
+def _event_type_key(code):
+    return f"et:{code}"
+
+
+def _templates_key(event_type_id):
+    return f"tpl:{event_type_id}"
+
+
+def _preferences_key(user_id):
+    return f"pref:{user_id}"
+
+
+def get_event_type(code):
+    """
+    Get the active event type for the given code, or None if there is none
+    """
+    return cache.get_or_set(
+        _event_type_key(code),
+        lambda: EventType.objects.filter(code=code, is_active=True).first(),
+        CACHE_TIMEOUT,
+    )
+
+
+def get_active_event_types():
+    """
+    Get every active event type, ordered by name
+    """
+    return cache.get_or_set(
+        _ACTIVE_EVENT_TYPES_KEY,
+        lambda: list(EventType.objects.filter(is_active=True).order_by("name")),
+        CACHE_TIMEOUT,
+    )
+
+
+def get_active_event_types_by_code():
+    """
+    Map the code of every active event type to the event type
+    """
+    return {event_type.code: event_type for event_type in get_active_event_types()}
+
+
+def get_templates_for(event_type_id):
+    """
+    Get the notification templates of an event type keyed by channel
+    """
+    return cache.get_or_set(
+        _templates_key(event_type_id),
+        lambda: {
+            template.channel: template
+            for template in NotificationTemplate.objects.filter(
+                event_type_id=event_type_id
+            )
+        },
+        CACHE_TIMEOUT,
+    )
+
+
+def get_user_preferences(user_id):
+    """
+    Get a user's channel preferences, or None if they have none yet
+    """
+    return cache.get_or_set(
+        _preferences_key(user_id),
+        lambda: NotificationPreference.objects.filter(user_id=user_id).first(),
+        CACHE_TIMEOUT,
+    )
+
+
+def invalidate_event_type(code):
+    cache.delete_many([_event_type_key(code), _ACTIVE_EVENT_TYPES_KEY])
+
+
+def invalidate_templates(event_type_id):
+    cache.delete(_templates_key(event_type_id))
+
+
+def invalidate_user_preferences(user_id):
+    cache.delete(_preferences_key(user_id))
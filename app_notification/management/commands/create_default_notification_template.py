@@ -1,5 +1,5 @@
 from django.core.management.base import BaseCommand
-from django.utils.timezone import now
+from app_notification.cache import invalidate_templates
 from app_notification.models import EventType, NotificationTemplate
 from app_notification.models import NotificationChannel
 
@@ -57,31 +57,43 @@ class Command(BaseCommand):
             }
         }
 
-        created_count = 0
+        events = {
+            event.code: event
+            for event in EventType.objects.filter(code__in=templates.keys())
+        }
+        existing = set(
+            NotificationTemplate.objects.filter(event_type__in=events.values())
+            .values_list('event_type_id', 'channel')
+        )
+
+        to_create = []
 
         for code, channels in templates.items():
-            try:
-                event = EventType.objects.get(code=code)
-            except EventType.DoesNotExist:
+            event = events.get(code)
+            if event is None:
                 self.stdout.write(self.style.ERROR(f"Event type '{code}' not found."))
                 continue
 
             for channel, content in channels.items():
-                obj, created = NotificationTemplate.objects.get_or_create(
-                    event_type=event,
-                    channel=channel,
-                    defaults={
-                        'title_template': content['title'],
-                        'message_template': content['message'],
-                        'is_active': True,
-                        'created_at': now(),
-                        'updated_at': now(),
-                    }
-                )
-                if created:
-                    created_count += 1
-                    self.stdout.write(self.style.SUCCESS(f"Created template for '{code}' [{channel}]"))
-                else:
+                if (event.id, channel) in existing:
                     self.stdout.write(self.style.WARNING(f"Template already exists for '{code}' [{channel}]"))
+                    continue
+
+                to_create.append(
+                    NotificationTemplate(
+                        event_type=event,
+                        channel=channel,
+                        title_template=content['title'],
+                        message_template=content['message'],
+                        is_active=True,
+                    )
+                )
+                self.stdout.write(self.style.SUCCESS(f"Created template for '{code}' [{channel}]"))
+
+        NotificationTemplate.objects.bulk_create(to_create, ignore_conflicts=True, batch_size=100)
+
+        # bulk_create skips post_save, so drop the cached templates here
+        for event in events.values():
+            invalidate_templates(event.id)
 
-        self.stdout.write(self.style.SUCCESS(f"Done. {created_count} new templates created."))
+        self.stdout.write(self.style.SUCCESS(f"Done. {len(to_create)} new templates created."))
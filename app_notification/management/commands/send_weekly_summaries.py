@@ -1,5 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
+from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
 from app_notification.services import NotificationService
@@ -10,28 +11,35 @@ class Command(BaseCommand):
     help = 'Send weekly summary notifications to all active users'
     
     def handle(self, *args, **options):
-        # Get active users
-        active_users = User.objects.filter(is_active=True)
-        
-        for user in active_users:
-            # Calculate notification count for the week
-            week_ago = timezone.now() - timedelta(days=7)
-            notification_count = user.notifications.filter(
-                created_at__gte=week_ago
-            ).count()
-            
+        now = timezone.now()
+        week_ago = now - timedelta(days=7)
+        week_start = week_ago.strftime('%Y-%m-%d')
+        week_end = now.strftime('%Y-%m-%d')
+
+        # Get active users with their notification count for the week
+        active_users = User.objects.filter(is_active=True).only('id').annotate(
+            weekly_count=Count(
+                'notifications',
+                filter=Q(notifications__created_at__gte=week_ago)
+            )
+        )
+
+        sent = 0
+        # Stream the users rather than materializing every active account
+        for user in active_users.iterator(chunk_size=2000):
             # Dispatch weekly summary
             NotificationService.dispatch_notification(
                 event_type_code='weekly_summary',
                 context={
                     'user_id': user.id,
-                    'notification_count': notification_count,
-                    'week_start': week_ago.strftime('%Y-%m-%d'),
-                    'week_end': timezone.now().strftime('%Y-%m-%d')
+                    'notification_count': user.weekly_count,
+                    'week_start': week_start,
+                    'week_end': week_end
                 },
                 target_users=[user.id]
             )
+            sent += 1
         
         self.stdout.write(
-            self.style.SUCCESS(f'Sent weekly summaries to {active_users.count()} users')
-        )
\ No newline at end of file
+            self.style.SUCCESS(f'Sent weekly summaries to {sent} users')
+        )
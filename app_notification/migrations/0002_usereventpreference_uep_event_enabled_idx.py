@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-15 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_notification', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='usereventpreference',
+            index=models.Index(fields=['event_type', 'is_enabled'], name='uep_event_enabled_idx'),
+        ),
+    ]
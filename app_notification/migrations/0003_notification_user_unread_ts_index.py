@@ -0,0 +1,21 @@
+# Generated by Django 5.2.4 on 2026-10-15 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_notification', '0002_usereventpreference_uep_event_enabled_idx'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notificatio_user_id_a4dd5c_idx',
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'is_read', '-created_at'], name='notif_user_unread_ts'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_notification', '0003_notification_user_unread_ts_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='metadata',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
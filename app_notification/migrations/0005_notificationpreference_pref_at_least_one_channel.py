@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-15 11:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_notification', '0004_alter_notification_metadata'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='notificationpreference',
+            constraint=models.CheckConstraint(condition=models.Q(('in_app_enabled', True), ('email_enabled', True), ('sms_enabled', True), _connector='OR'), name='pref_at_least_one_channel'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.4 on 2026-10-15 12:10
+
+from django.db import migrations, models
+
+
+def backfill_post_id(apps, schema_editor):
+    Notification = apps.get_model('app_notification', 'Notification')
+
+    batch = []
+    for notification in (
+        Notification.objects.filter(metadata__has_key='post_id')
+        .only('id', 'metadata')
+        .iterator(chunk_size=2000)
+    ):
+        try:
+            notification.post_id = int(notification.metadata['post_id'])
+        except (TypeError, ValueError):
+            continue
+        batch.append(notification)
+        if len(batch) >= 2000:
+            Notification.objects.bulk_update(batch, ['post_id'])
+            batch = []
+
+    if batch:
+        Notification.objects.bulk_update(batch, ['post_id'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_notification', '0005_notificationpreference_pref_at_least_one_channel'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='post_id',
+            field=models.BigIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.RunPython(backfill_post_id, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.4 on 2026-10-15 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app_notification', '0006_notification_post_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'event_type', '-created_at'], name='notif_user_event_ts'),
+        ),
+    ]
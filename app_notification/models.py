@@ -1,8 +1,44 @@
-from django.db import models
-from django.contrib.auth import get_user_model
+import string
+from functools import lru_cache
+from django.conf import settings
+from django.db import models, transaction
 from django.core.exceptions import ValidationError
+from django.utils.functional import cached_property
 
-User = get_user_model()
+_formatter = string.Formatter()
+
+
+_CONVERSIONS = {"s": "str", "r": "repr", "a": "ascii"}
+
+
+@lru_cache(maxsize=512)
+def _compile_format(template):
+    """
+    Compile a str.format template into a function rendering it from a context
+    dict. Field names and literals are embedded as constants, never as code.
+    Templates with nested format specs are left to str.format
+    """
+    parts = []
+    for literal, field_name, format_spec, conversion in _formatter.parse(template):
+        if literal:
+            parts.append(repr(literal))
+        if field_name is None:
+            continue
+        if "{" in format_spec:
+            return lambda context: template.format(**context)
+
+        if field_name.isidentifier():
+            value = f"context[{field_name!r}]"
+        else:
+            value = f"_get_field({field_name!r}, (), context)[0]"
+        if conversion:
+            if conversion not in _CONVERSIONS:
+                raise ValueError(f"Unknown conversion specifier {conversion}")
+            value = f"{_CONVERSIONS[conversion]}({value})"
+        parts.append(f"format({value}, {format_spec!r})")
+
+    source = f"lambda context: ''.join([{', '.join(parts)}])"
+    return eval(source, {"_get_field": _formatter.get_field})
 
 
 class NotificationChannel(models.TextChoices):
@@ -40,6 +76,15 @@ class EventType(models.Model):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def get_cached(cls, code):
+        """
+        Get the active event type for the given code from the cache, or None
+        """
+        from .cache import get_event_type
+
+        return get_event_type(code)
+
     @classmethod
     def get_default_event_types(cls):
         """Create default event types if they don't exist"""
@@ -64,8 +109,31 @@ class EventType(models.Model):
             },
         ]
 
-        for event_data in defaults:
-            cls.objects.get_or_create(code=event_data["code"], defaults=event_data)
+        # Runs on every signup, so only write (and evict cache entries) for
+        # the defaults that are actually missing
+        existing = set(
+            cls.objects.filter(
+                code__in=[event_data["code"] for event_data in defaults]
+            ).values_list("code", flat=True)
+        )
+        missing = [
+            event_data for event_data in defaults if event_data["code"] not in existing
+        ]
+        if not missing:
+            return
+
+        cls.objects.bulk_create(
+            [cls(**event_data) for event_data in missing], ignore_conflicts=True
+        )
+
+        # bulk_create skips post_save, so drop any cached misses here once
+        # the rows are committed
+        from .cache import invalidate_event_type
+
+        for event_data in missing:
+            transaction.on_commit(
+                lambda code=event_data["code"]: invalidate_event_type(code)
+            )
 
 
 class DeliveryStatus(models.TextChoices):
@@ -83,7 +151,9 @@ class UserEventPreference(models.Model):
     """
 
     user = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="event_preferences"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="event_preferences",
     )
     event_type = models.ForeignKey(
         EventType, on_delete=models.CASCADE, related_name="user_preferences"
@@ -98,6 +168,11 @@ class UserEventPreference(models.Model):
         verbose_name = "User Event Preference"
         verbose_name_plural = "User Event Preferences"
         unique_together = [["user", "event_type"]]
+        indexes = [
+            models.Index(
+                fields=["event_type", "is_enabled"], name="uep_event_enabled_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.event_type.name} - {self.is_enabled}"
@@ -109,7 +184,9 @@ class NotificationPreference(models.Model):
     """
 
     user = models.OneToOneField(
-        User, on_delete=models.CASCADE, related_name="notification_preferences"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notification_preferences",
     )
     in_app_enabled = models.BooleanField(default=True)
     email_enabled = models.BooleanField(default=True)
@@ -122,8 +199,21 @@ class NotificationPreference(models.Model):
         db_table = "notification_preferences"
         verbose_name = "Notification Preference"
         verbose_name_plural = "Notification Preferences"
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(in_app_enabled=True)
+                | models.Q(email_enabled=True)
+                | models.Q(sms_enabled=True),
+                name="pref_at_least_one_channel",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.__dict__.pop("enabled_channels", None)
+        super().save(*args, **kwargs)
 
-    def get_enabled_channels(self):
+    @cached_property
+    def enabled_channels(self):
         """
         Get all enabled channels for this user
         """
@@ -135,22 +225,7 @@ class NotificationPreference(models.Model):
         if self.sms_enabled:
             channels.append(NotificationChannel.SMS)
 
-        return channels
-
-    def is_event_enabled(self, event_type_code):
-        """
-        Check if user wants to receive notifications for this event type
-        """
-        try:
-            event_type = EventType.objects.get(code=event_type_code, is_active=True)
-            preference, created = UserEventPreference.objects.get_or_create(
-                user=self.user,
-                event_type=event_type,
-                defaults={"is_enabled": event_type.default_enabled},
-            )
-            return preference.is_enabled
-        except EventType.DoesNotExist:
-            return False
+        return tuple(channels)
 
 
 class Notification(models.Model):
@@ -158,15 +233,23 @@ class Notification(models.Model):
     Model to store individual notifications
     """
 
+    # Every composite index below leads with user, so the FK needs none of
+    # its own
     user = models.ForeignKey(
-        User, on_delete=models.CASCADE, related_name="notifications"
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="notifications",
+        db_index=False,
     )
     event_type = models.ForeignKey(
         EventType, on_delete=models.CASCADE, related_name="notifications"
     )
     title = models.CharField(max_length=255)
     message = models.TextField()
-    metadata = models.JSONField(default=dict, blank=True)
+    # NULL rather than {} when the event carried no payload
+    metadata = models.JSONField(null=True, blank=True)
+    # Copied out of metadata so lookups by post hit a plain index
+    post_id = models.BigIntegerField(null=True, blank=True, db_index=True)
 
     is_read = models.BooleanField(default=False)
     read_at = models.DateTimeField(null=True, blank=True)
@@ -180,8 +263,15 @@ class Notification(models.Model):
         verbose_name_plural = "Notifications"
         ordering = ["-created_at"]
         indexes = [
-            models.Index(fields=["user", "-created_at"]),
-            models.Index(fields=["user", "is_read"]),
+            models.Index(fields=["user", "-created_at"], name="notif_user_ct"),
+            # Serves the unread feed's filter and ordering in one index scan
+            models.Index(
+                fields=["user", "is_read", "-created_at"], name="notif_user_unread_ts"
+            ),
+            # Both feeds can be filtered by event type
+            models.Index(
+                fields=["user", "event_type", "-created_at"], name="notif_user_event_ts"
+            ),
         ]
 
     def __str__(self):
@@ -248,10 +338,25 @@ class NotificationTemplate(models.Model):
         verbose_name_plural = "Notification Templates"
         unique_together = [["event_type", "channel"]]
 
+    def __getstate__(self):
+        # Compiled render functions can't be pickled into the cache
+        state = super().__getstate__()
+        state.pop("_title_fn", None)
+        state.pop("_message_fn", None)
+        return state
+
+    @cached_property
+    def _title_fn(self):
+        return _compile_format(self.title_template)
+
+    @cached_property
+    def _message_fn(self):
+        return _compile_format(self.message_template)
+
     def render(self, context):
         """
         Render template with given context
         """
-        title = self.title_template.format(**context)
-        message = self.message_template.format(**context)
+        title = self._title_fn(context)
+        message = self._message_fn(context)
         return title, message
@@ -1,4 +1,4 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 
 
@@ -25,3 +25,15 @@ class StandardResultsSetPagination(PageNumberPagination):
                 "results": data,
             }
         )
+
+
+class NotificationCursorPagination(CursorPagination):
+    """
+    Keyset pagination on created_at for feeds that keep growing, so every
+    page is a bounded index range scan instead of an OFFSET over prior pages
+    """
+
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-created_at"
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db.models import Prefetch
 from .models import (
     Notification,
     NotificationPreference,
@@ -11,6 +12,9 @@ from .models import (
 
 User = get_user_model()
 
+# Upper bound on ids per mark-as-read request, keeping the IN (...) list small
+MAX_MARK_AS_READ_IDS = 1000
+
 
 class EventTypeSerializer(serializers.ModelSerializer):
     """
@@ -40,9 +44,7 @@ class UserEventPreferenceSerializer(serializers.ModelSerializer):
         """
         Validate that the event type exists and is active
         """
-        try:
-            EventType.objects.get(code=value, is_active=True)
-        except EventType.DoesNotExist:
+        if EventType.get_cached(value) is None:
             raise serializers.ValidationError(
                 f"Event type '{value}' does not exist or is inactive"
             )
@@ -69,16 +71,23 @@ class NotificationPreferenceSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["updated_at", "event_preferences"]
 
+    @classmethod
+    def event_preferences_prefetch(cls):
+        """
+        Prefetch for the nested event preferences together with their event types
+        """
+        return Prefetch(
+            "user__event_preferences",
+            queryset=UserEventPreference.objects.select_related("event_type"),
+        )
+
     def validate(self, data):
         """
-        Custom validation to ensure at least one channel is enabled
+        Mirror the pref_at_least_one_channel constraint to give a readable error
         """
         channels_enabled = any(
-            [
-                data.get("in_app_enabled", False),
-                data.get("email_enabled", False),
-                data.get("sms_enabled", False),
-            ]
+            data.get(field, getattr(self.instance, field, False))
+            for field in ("in_app_enabled", "email_enabled", "sms_enabled")
         )
 
         if not channels_enabled:
@@ -103,28 +112,25 @@ class UpdateEventPreferenceSerializer(serializers.Serializer):
         """
         Validate the preferences structure
         """
-        valid_preferences = []
         for pref in value:
             if "event_type_code" not in pref or "is_enabled" not in pref:
                 raise serializers.ValidationError(
                     "Each preference must have 'event_type_code' and 'is_enabled' fields"
                 )
 
+        # Event type codes are resolved in one query by the view
+        valid_preferences = []
+        for pref in value:
             is_enabled = pref["is_enabled"]
             if isinstance(is_enabled, str):
                 is_enabled = is_enabled.lower() in ["true", "1", "yes"]
 
-            try:
-                event_type = EventType.objects.get(
-                    code=pref["event_type_code"], is_active=True
-                )
-                valid_preferences.append(
-                    {"event_type": event_type, "is_enabled": bool(is_enabled)}
-                )
-            except EventType.DoesNotExist:
-                raise serializers.ValidationError(
-                    f"Event type '{pref['event_type_code']}' does not exist or is inactive"
-                )
+            valid_preferences.append(
+                {
+                    "event_type_code": pref["event_type_code"],
+                    "is_enabled": bool(is_enabled),
+                }
+            )
 
         return valid_preferences
 
@@ -153,6 +159,7 @@ class NotificationSerializer(serializers.ModelSerializer):
     """
 
     deliveries = NotificationDeliverySerializer(many=True, read_only=True)
+    metadata = serializers.SerializerMethodField()
 
     class Meta:
         model = Notification
@@ -169,14 +176,43 @@ class NotificationSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["id", "created_at", "deliveries"]
 
+    @classmethod
+    def setup_eager_loading(cls, queryset):
+        """
+        Load only the columns and delivery rows rendered by this serializer
+        """
+        # event_type is rendered as a primary key, which the FK column already
+        # holds, so the event type row itself is never needed
+        columns = [field for field in cls.Meta.fields if field != "deliveries"]
+
+        # Retries update the delivery row in place (one per notification and
+        # channel), so the prefetch is already bounded by the channel count
+        return queryset.only(*columns).prefetch_related(
+            Prefetch(
+                "deliveries",
+                queryset=NotificationDelivery.objects.only(
+                    "notification_id", *NotificationDeliverySerializer.Meta.fields
+                ),
+            )
+        )
+
+    def get_metadata(self, obj):
+        return obj.metadata or {}
+
 
-class NotificationListSerializer(serializers.ModelSerializer):
+class NotificationListSerializer(serializers.Serializer):
     """
-    Lightweight serializer for notification lists
+    Lightweight serializer for notification lists, fed by rows from .values()
     """
 
+    id = serializers.IntegerField(read_only=True)
+    event_type = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(read_only=True)
+    message = serializers.CharField(read_only=True)
+    is_read = serializers.BooleanField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+
     class Meta:
-        model = Notification
         fields = ["id", "event_type", "title", "message", "is_read", "created_at"]
 
 
@@ -188,6 +224,7 @@ class MarkAsReadSerializer(serializers.Serializer):
     notification_ids = serializers.ListField(
         child=serializers.IntegerField(),
         allow_empty=False,
+        max_length=MAX_MARK_AS_READ_IDS,
         help_text="List of notification IDs to mark as read",
     )
 
@@ -196,12 +233,12 @@ class MarkAsReadSerializer(serializers.Serializer):
         Validate that all notification IDs belong to the current user
         """
         user = self.context["request"].user
-        valid_ids = Notification.objects.filter(id__in=value, user=user).values_list(
-            "id", flat=True
-        )
+        requested_ids = set(value)
+        owned = Notification.objects.filter(id__in=requested_ids, user=user)
 
-        invalid_ids = set(value) - set(valid_ids)
-        if invalid_ids:
+        # Only pull the ids back when the count shows some are invalid
+        if owned.count() != len(requested_ids):
+            invalid_ids = requested_ids - set(owned.values_list("id", flat=True))
             raise serializers.ValidationError(
                 f"Invalid notification IDs: {list(invalid_ids)}"
             )
@@ -219,16 +256,17 @@ class EventTriggerSerializer(serializers.Serializer):
     target_users = serializers.ListField(
         child=serializers.IntegerField(),
         required=False,
-        help_text="List of user IDs to notify. If empty, will determine based on event type.",
+        help_text=(
+            "List of user IDs to notify. If omitted, will determine based on "
+            "event type; broadcast events are queued for every active user."
+        ),
     )
 
     def validate_event_type_code(self, value):
         """
         Validate that the event type exists and is active
         """
-        try:
-            EventType.objects.get(code=value, is_active=True)
-        except EventType.DoesNotExist:
+        if EventType.get_cached(value) is None:
             raise serializers.ValidationError(
                 f"Event type '{value}' does not exist or is inactive"
             )
@@ -239,11 +277,14 @@ class EventTriggerSerializer(serializers.Serializer):
         Validate that target users exist
         """
         if value:
-            existing_users = User.objects.filter(id__in=value).values_list(
-                "id", flat=True
-            )
-            invalid_users = set(value) - set(existing_users)
-            if invalid_users:
+            requested_ids = set(value)
+            existing_users = User.objects.filter(id__in=requested_ids)
+
+            # Only pull the ids back when the count shows some are invalid
+            if existing_users.count() != len(requested_ids):
+                invalid_users = requested_ids - set(
+                    existing_users.values_list("id", flat=True)
+                )
                 raise serializers.ValidationError(
                     f"Invalid user IDs: {list(invalid_users)}"
                 )
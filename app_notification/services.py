@@ -1,8 +1,11 @@
-from typing import List, Dict, Any, Optional
+from collections import defaultdict
+from itertools import islice
+from typing import List, Dict, Any, Iterable, Optional
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.db import transaction
-from celery import shared_task
+from django.db.models import F, Max, Min
+from celery import group, shared_task
 import logging
 from .models import (
     Notification,
@@ -15,10 +18,62 @@ from .models import (
     UserEventPreference,
 )
 from .backend import get_notification_backend
+from .cache import get_event_type, get_templates_for
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
+# Target users are processed in batches of this size so a broadcast event
+# never holds every recipient's user and preference rows in memory at once
+DISPATCH_BATCH_SIZE = 500
+
+# Events sent to every active user are split into contiguous user id ranges
+# of this size, each dispatched by its own task
+BROADCAST_EVENT_CODES = {"weekly_summary"}
+DISPATCH_SHARD_SIZE = 5000
+
+# User columns read by the notification backends
+BACKEND_USER_FIELDS = ("id", "username", "email", "phone_number")
+
+_EMAIL, _SMS = NotificationChannel.EMAIL.value, NotificationChannel.SMS.value
+
+# Email and SMS deliveries go to dedicated queues so slow providers
+# don't hold up in-app delivery on the default queue
+DELIVERY_QUEUES = {
+    _EMAIL: "email",
+    _SMS: "sms",
+}
+
+
+def _context_post_id(context):
+    """
+    Extract the post id an event refers to, if any, for the indexed column
+    """
+    try:
+        return int(context["post_id"])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _unique_targets(user_ids, actor_id=None):
+    """
+    Yield each target user id once, skipping blanks and the event's actor
+    """
+    seen = set()
+    for user_id in user_ids:
+        if user_id and user_id != actor_id and user_id not in seen:
+            seen.add(user_id)
+            yield user_id
+
+
+def _chunked(iterable, size):
+    """
+    Yield successive lists of at most size items from iterable
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
 
 class NotificationService:
     """
@@ -32,110 +87,228 @@ class NotificationService:
         """
         Create a notification for a user using dynamic event type
         """
-        try:
-            event_type = EventType.objects.get(code=event_type_code, is_active=True)
-        except EventType.DoesNotExist:
+        event_type = get_event_type(event_type_code)
+        if event_type is None:
             raise ValueError(
                 f"Event type '{event_type_code}' does not exist or is inactive"
             )
 
-        logger.info(
-            "******************* Getting notification template started *******************"
-        )
         template = cls._get_template(event_type, NotificationChannel.IN_APP)
         title, message = template.render(context)
 
-        notification = Notification.objects.create(
+        notification = cls._build_notification(
+            user, event_type, title, message, context
+        )
+        notification.save()
+
+        logger.info("Created notification %s for user %s", notification.id, user.id)
+        return notification
+
+    @classmethod
+    def _build_notification(
+        cls,
+        user: User,
+        event_type: EventType,
+        title: str,
+        message: str,
+        context: Dict[str, Any],
+    ) -> Notification:
+        """
+        Build an unsaved notification so callers can insert them in bulk
+        """
+        return Notification(
             user=user,
             event_type=event_type,
             title=title,
             message=message,
-            metadata=context,
+            metadata=context or None,
+            post_id=_context_post_id(context),
         )
 
-        logger.info(f"Created notification {notification.id} for user {user.id}")
-        return notification
-
     @classmethod
     def dispatch_notification(
         cls,
         event_type_code: str,
         context: Dict[str, Any],
-        target_users: Optional[List[int]] = None,
-    ) -> List[Notification]:
+        target_users: Optional[Iterable[int]] = None,
+    ) -> List[int]:
         """
-        Dispatch notifications to multiple users based on their preferences
+        Dispatch notifications to multiple users based on their preferences,
+        returning the ids of the notifications created
         """
-        logger.info(
-            "******************* Dispatching notification started *******************"
-        )
+        # Nobody to notify, so skip the event type lookup and rendering
+        if target_users is not None and not target_users:
+            return []
 
-        try:
-            event_type = EventType.objects.get(code=event_type_code, is_active=True)
-        except EventType.DoesNotExist:
+        event_type = get_event_type(event_type_code)
+        if event_type is None:
             logger.error(
-                f"Event type '{event_type_code}' does not exist or is inactive"
+                "Event type '%s' does not exist or is inactive", event_type_code
             )
             return []
 
+        if target_users is None and event_type_code in BROADCAST_EVENT_CODES:
+            cls._dispatch_broadcast(event_type_code, context)
+            return []
+
         if target_users is None:
-            logger.info(
-                "******************* No target users provided, determining target users *******************"
-            )
-            target_users = cls._determine_target_users(
-                event_type_code, context
-            )  # determine target user
+            target_users = cls._determine_target_users(event_type_code, context)
+            if not target_users:
+                return []
 
-        logger.info(
-            "******************* Target user Fetched sucessfully *******************"
-        )
+        # The context is shared by every recipient, so render the message once
+        try:
+            template = cls._get_template(event_type, NotificationChannel.IN_APP)
+            title, message = template.render(context)
+        except Exception as e:
+            logger.error(
+                "Error rendering notification for event %s: %s", event_type_code, e
+            )
+            return []
 
-        notifications = []
+        # Nobody is notified twice, nor about their own action
+        target_users = _unique_targets(target_users, context.get("actor_id"))
 
-        for user_id in target_users:
-            try:
-                user = User.objects.get(id=user_id)
-                logger.info(
-                    "*******************Getting user preferences started *******************"
+        # Only ids are kept across batches, so each batch's instances can be
+        # freed once it has been written and queued
+        notification_ids = []
+        for user_ids in _chunked(target_users, DISPATCH_BATCH_SIZE):
+            notification_ids.extend(
+                cls._dispatch_batch(
+                    event_type, event_type_code, context, title, message, user_ids
                 )
+            )
 
-                preferences = cls._get_user_preferences(user)  # get user preferences
+        logger.debug(
+            "dispatch event=%s notifications=%d", event_type_code, len(notification_ids)
+        )
+        return notification_ids
 
-                if preferences.is_event_enabled(event_type_code):
+    @classmethod
+    def _dispatch_broadcast(cls, event_type_code: str, context: Dict[str, Any]):
+        """
+        Fan a broadcast event out to shard tasks over active user id ranges
+        """
+        bounds = User.objects.filter(is_active=True).aggregate(
+            lo=Min("id"), hi=Max("id")
+        )
+        if bounds["lo"] is None:
+            return
+
+        shards = group(
+            dispatch_notification_shard.s(
+                event_type_code,
+                context,
+                start,
+                min(start + DISPATCH_SHARD_SIZE - 1, bounds["hi"]),
+            )
+            for start in range(bounds["lo"], bounds["hi"] + 1, DISPATCH_SHARD_SIZE)
+        )
+        shards.apply_async()
+        logger.info("Queued %d shards for event %s", len(shards.tasks), event_type_code)
 
-                    logger.info(
-                        "******************* Creating notification started *******************"
-                    )
-                    notification = cls.create_notification(
-                        user, event_type_code, context
-                    )
-                    notifications.append(notification)
+    @classmethod
+    def _dispatch_batch(
+        cls,
+        event_type: EventType,
+        event_type_code: str,
+        context: Dict[str, Any],
+        title: str,
+        message: str,
+        user_ids: List[int],
+    ) -> List[int]:
+        """
+        Create and schedule notifications for one batch of target users,
+        returning the new notification ids
+        """
+        # Fetch the batch's users and their channel preferences up front
+        # instead of issuing a lookup per user inside the loop. Only the user
+        # columns read by the delivery backends are loaded
+        users = User.objects.only(*BACKEND_USER_FIELDS).in_bulk(user_ids)
+        preferences_by_user = {}
+        for preference in NotificationPreference.objects.filter(
+            user_id__in=users.keys()
+        ):
+            preference.user = users[preference.user_id]
+            preferences_by_user[preference.user_id] = preference
+
+        # Users without a stored choice for this event get its default
+        event_enabled_by_user = dict(
+            UserEventPreference.objects.filter(
+                user_id__in=users.keys(), event_type=event_type
+            ).values_list("user_id", "is_enabled")
+        )
 
-                    # Schedule delivery tasks
-                    logger.info(
-                        "******************* Getting enabled channels started *******************"
-                    )
-                    enabled_channels = preferences.get_enabled_channels()
-                    logger.info(
-                        f"Enabled channels for user {user.id}: {enabled_channels}"
-                    )
-                    for channel in enabled_channels:
-                        logger.info(
-                            "******************* Delivering notification task started *******************"
-                        )
-                        deliver_notification_task.delay(
-                            notification.id, channel
-                        )  # using celery
-                        # deliver_notification_task(notification.id, channel) #without celery
+        notifications = []
+        enabled_channels_by_user = {}
 
-            except User.DoesNotExist:
-                logger.warning(f"User {user_id} not found")
+        for user_id in user_ids:
+            user = users.get(user_id)
+            if user is None:
+                logger.warning("User %s not found", user_id)
                 continue
+
+            try:
+                preferences = preferences_by_user.get(user.id)
+                if preferences is None:
+                    preferences = cls._get_user_preferences(user)
+
+                # SMS can never succeed without a phone number, so don't
+                # schedule a delivery that would only fail and retry. The
+                # notification itself is still recorded for the user's feed
+                channels = [
+                    channel
+                    for channel in preferences.enabled_channels
+                    if channel != _SMS or user.phone_number
+                ]
+
+                if event_enabled_by_user.get(user.id, event_type.default_enabled):
+                    notifications.append(
+                        cls._build_notification(
+                            user, event_type, title, message, context
+                        )
+                    )
+                    enabled_channels_by_user[user.id] = channels
+
             except Exception as e:
-                logger.error(f"Error dispatching notification to user {user_id}: {e}")
+                logger.error(
+                    "Error dispatching notification to user %s: %s", user_id, e
+                )
                 continue
 
-        return notifications
+        # Record a pending delivery per channel alongside the notifications so
+        # the delivery tasks find their rows instead of inserting one each
+        with transaction.atomic():
+            notifications = Notification.objects.bulk_create(notifications)
+            NotificationDelivery.objects.bulk_create(
+                [
+                    NotificationDelivery(notification=notification, channel=channel)
+                    for notification in notifications
+                    for channel in enabled_channels_by_user[notification.user_id]
+                ]
+            )
+        logger.info(
+            "Created %d notifications for event %s", len(notifications), event_type_code
+        )
+
+        # Schedule one delivery task per channel for the whole batch,
+        # publishing them over one pooled broker connection
+        ids_by_channel = defaultdict(list)
+        for notification in notifications:
+            for channel in enabled_channels_by_user[notification.user_id]:
+                ids_by_channel[channel].append(notification.id)
+
+        producer_pool = deliver_notifications_batch_task.app.producer_pool
+        with producer_pool.acquire(block=True) as producer:
+            for channel, notification_ids in ids_by_channel.items():
+                deliver_notifications_batch_task.apply_async(
+                    (notification_ids, channel),
+                    queue=DELIVERY_QUEUES.get(channel),
+                    producer=producer,
+                )
+
+        # bulk_create sets primary keys from INSERT ... RETURNING
+        return [notification.id for notification in notifications]
 
     @classmethod
     def update_user_event_preferences(
@@ -144,20 +317,28 @@ class NotificationService:
         """
         Update user's event preferences
         """
-        updated_preferences = []
-
-        for pref_data in preferences:
-            event_type = pref_data["event_type"]
-            is_enabled = pref_data["is_enabled"]
-
-            preference, created = UserEventPreference.objects.update_or_create(
-                user=user, event_type=event_type, defaults={"is_enabled": is_enabled}
+        # One row per event type, the last entry winning, since an upsert
+        # can't touch the same row twice in a single statement
+        objs = {
+            pref_data["event_type"].id: UserEventPreference(
+                user=user,
+                event_type=pref_data["event_type"],
+                is_enabled=pref_data["is_enabled"],
             )
-            updated_preferences.append(preference)
+            for pref_data in preferences
+        }
 
-            logger.info(
-                f"Updated event preference for user {user.id}: {event_type.code} = {is_enabled}"
-            )
+        updated_preferences = UserEventPreference.objects.bulk_create(
+            objs.values(),
+            update_conflicts=True,
+            update_fields=["is_enabled", "updated_at"],
+            unique_fields=["user", "event_type"],
+        )
+        logger.info(
+            "Updated %d event preferences for user %s",
+            len(updated_preferences),
+            user.id,
+        )
 
         return updated_preferences
 
@@ -179,8 +360,12 @@ class NotificationService:
         )
 
         if created:
-            logger.info(f"Created new event type: {code}")
-            cls._create_default_preferences_for_event_type(event_type)
+            from .tasks import create_default_prefs_for_event_type
+
+            logger.info("Created new event type: %s", code)
+            transaction.on_commit(
+                lambda: create_default_prefs_for_event_type.delay(event_type.id)
+            )
 
         return event_type
 
@@ -189,33 +374,45 @@ class NotificationService:
         """
         Create default preferences for all existing users when a new event type is added
         """
-        users = User.objects.all()
-        preferences_to_create = []
+        existing = UserEventPreference.objects.filter(
+            event_type=event_type
+        ).values_list("user_id", flat=True)
+        # Stream the ids of users still missing a preference and insert them
+        # in batches rather than loading and checking every user in turn
+        missing_user_ids = (
+            User.objects.exclude(id__in=existing)
+            .values_list("id", flat=True)
+            .iterator(chunk_size=5000)
+        )
 
-        for user in users:
-            if not UserEventPreference.objects.filter(
-                user=user, event_type=event_type
-            ).exists():
-                preferences_to_create.append(
+        created = 0
+        for user_ids in _chunked(missing_user_ids, DISPATCH_BATCH_SIZE):
+            UserEventPreference.objects.bulk_create(
+                [
                     UserEventPreference(
-                        user=user,
+                        user_id=user_id,
                         event_type=event_type,
                         is_enabled=event_type.default_enabled,
                     )
-                )
-
-        if preferences_to_create:
-            UserEventPreference.objects.bulk_create(preferences_to_create)
-            logger.info(
-                f"Created default preferences for {len(preferences_to_create)} users"
+                    for user_id in user_ids
+                ],
+                ignore_conflicts=True,
             )
+            created += len(user_ids)
+
+        if created:
+            logger.info("Created default preferences for %d users", created)
 
     @classmethod
     def _get_template(cls, event_type: EventType, channel: str) -> NotificationTemplate:
         """
         Get or create notification template for dynamic event type
         """
+        template = get_templates_for(event_type.id).get(channel)
+        if template is not None:
+            return template
 
+        # Creating the template fires post_save, which drops the cached set
         template, created = NotificationTemplate.objects.get_or_create(
             event_type=event_type,
             channel=channel,
@@ -260,24 +457,18 @@ class NotificationService:
     @classmethod
     def _determine_target_users(
         cls, event_type_code: str, context: Dict[str, Any]
-    ) -> List[int]:
+    ) -> Iterable[int]:
         """
         Determine target users based on dynamic event type and context
         """
-        logger.info(
-            "******************* Determining target users started *******************"
-        )
-
         if event_type_code == "new_comment":
             return context.get("target_users", [])
 
         elif event_type_code == "unrecognized_login":
             return [context.get("user_id")]
 
-        elif event_type_code == "weekly_summary":
-            return list(
-                User.objects.filter(is_active=True).values_list("id", flat=True)
-            )
+        # Broadcast events (BROADCAST_EVENT_CODES) are sharded by
+        # dispatch_notification and never reach here
         return context.get("target_users", [])
 
     @classmethod
@@ -289,7 +480,9 @@ class NotificationService:
             id__in=notification_ids, user=user, is_read=False
         ).update(is_read=True, read_at=timezone.now())
 
-        logger.info(f"Marked {updated_count} notifications as read for user {user.id}")
+        logger.info(
+            "Marked %d notifications as read for user %s", updated_count, user.id
+        )
         return updated_count
 
     @classmethod
@@ -306,8 +499,14 @@ class NotificationService:
             },
         )
 
+        # Missing event preferences fall back to each event's default until
+        # the task has written them
         if created:
-            cls._create_default_event_preferences(user)
+            from .tasks import create_default_event_prefs_for_user
+
+            transaction.on_commit(
+                lambda: create_default_event_prefs_for_user.delay(user.id)
+            )
 
         return preferences
 
@@ -329,85 +528,97 @@ class NotificationService:
                 )
             )
 
-        UserEventPreference.objects.bulk_create(preferences_to_create)
-        logger.info(f"Created default event preferences for user {user.id}")
-
-    @classmethod
-    def _get_template(cls, event_type: str, channel: str) -> NotificationTemplate:
-        """
-        Get or create notification template
-        """
-
-        get_template = NotificationTemplate.objects.get(
-            event_type=event_type, channel=channel
+        UserEventPreference.objects.bulk_create(
+            preferences_to_create, ignore_conflicts=True
         )
-        defaults = cls._get_default_template(event_type.code, channel)
+        logger.info("Created default event preferences for user %s", user.id)
 
-        if defaults:
-            template, created = NotificationTemplate.objects.get_or_create(
-                event_type=event_type, channel=channel, defaults=defaults
-            )
-        else:
-            try:
-                template = NotificationTemplate.objects.get(
-                    event_type=event_type, channel=channel
-                )
-            except NotificationTemplate.DoesNotExist:
-                logger.warning(
-                    f"No template found for event type {event_type} and channel {channel}, please create one."
-                )
-                template = None
-        return template
 
-    @classmethod
-    def _get_default_template(cls, event_type: str, channel: str) -> Dict[str, str]:
-        """
-        Get default template content. If the event_type is not found, add a default entry.
-        """
-        templates = {
-            "new_comment": {
-                "title_template": "New Comment on {post_title}",
-                "message_template": '{commenter} commented: "{comment_text}"',
-            },
-            "unrecognized_login": {
-                "title_template": "New Login Detected",
-                "message_template": "New login from {device} at {location} on {timestamp}",
-            },
-            "weekly_summary": {
-                "title_template": "Your Weekly Summary",
-                "message_template": "You have {notification_count} new notifications this week.",
-            },
-        }
+@shared_task
+def dispatch_notification_shard(
+    event_type_code: str, context: Dict[str, Any], user_id_lo: int, user_id_hi: int
+):
+    """
+    Celery task to dispatch a broadcast event to one range of active users
+    """
+    user_ids = list(
+        User.objects.filter(
+            is_active=True, id__range=(user_id_lo, user_id_hi)
+        ).values_list("id", flat=True)
+    )
+    if not user_ids:
+        return 0
 
-        default_template = {
-            "title_template": "Notification",
-            "message_template": "You have a new notification.",
-        }
+    notification_ids = NotificationService.dispatch_notification(
+        event_type_code=event_type_code, context=context, target_users=user_ids
+    )
+    return len(notification_ids)
 
-        if event_type not in templates:
-            templates[event_type] = default_template  # Add it to templates
 
-        return templates[event_type]
+@shared_task
+def deliver_notifications_batch_task(notification_ids: List[int], channel: str):
+    """
+    Celery task to deliver a batch of notifications via one channel
+    """
+    notifications = list(
+        Notification.objects.select_related("user")
+        .only(
+            "id",
+            "title",
+            "message",
+            *(f"user__{field}" for field in BACKEND_USER_FIELDS),
+        )
+        .filter(id__in=notification_ids)
+    )
+    if not notifications:
+        return 0
 
-    @classmethod
-    def _determine_target_users(
-        cls, event_type: str, context: Dict[str, Any]
-    ) -> List[int]:
-        """
-        Determine target users based on event type and context
-        """
-        if event_type == EventType.NEW_COMMENT:
-            return context.get("follower_ids", [])
+    backend = get_notification_backend(channel)
+    deliveries = NotificationDelivery.objects.filter(
+        notification_id__in=[notification.id for notification in notifications],
+        channel=channel,
+    )
 
-        elif event_type == EventType.UNRECOGNIZED_LOGIN:
-            return [context.get("user_id")]
+    now = timezone.now()
+    deliveries.update(attempted_at=now, updated_at=now)
 
-        elif event_type == EventType.WEEKLY_SUMMARY:
-            return list(
-                User.objects.filter(is_active=True).values_list("id", flat=True)
+    try:
+        results = backend.send_notifications(notifications)
+    except Exception as e:
+        logger.error("Failed to deliver batch via %s: %s", channel, e)
+        results = [False] * len(notifications)
+
+    sent_ids, failed_ids = [], []
+    for notification, success in zip(notifications, results):
+        (sent_ids if success else failed_ids).append(notification.id)
+
+    now = timezone.now()
+    if sent_ids:
+        deliveries.filter(notification_id__in=sent_ids).update(
+            status=DeliveryStatus.SENT, delivered_at=now, updated_at=now
+        )
+    if failed_ids:
+        deliveries.filter(notification_id__in=failed_ids).update(
+            status=DeliveryStatus.FAILED,
+            failed_at=now,
+            error_message="Backend returned failure",
+            retry_count=F("retry_count") + 1,
+            updated_at=now,
+        )
+        logger.error(
+            "Failed to deliver %d notifications via %s", len(failed_ids), channel
+        )
+
+        # Failures go back through the single-notification task and its
+        # exponential backoff, starting from the first retry
+        for notification_id in failed_ids:
+            deliver_notification_task.apply_async(
+                (notification_id, channel),
+                queue=DELIVERY_QUEUES.get(channel),
+                countdown=60 * 2,
             )
 
-        return []
+    return len(sent_ids)
 
 
 @shared_task(bind=True, max_retries=3)
@@ -415,63 +626,84 @@ def deliver_notification_task(self, notification_id: int, channel: str):
     """
     Celery task to deliver notification via specific channel
     """
-    logger.info(
-        "******************* Delivering notification task started *******************"
-    )
-
     try:
-        notification = Notification.objects.get(id=notification_id)
-
-        # Create or get delivery record
-        delivery, created = NotificationDelivery.objects.get_or_create(
-            notification=notification,
-            channel=channel,
-            defaults={"status": DeliveryStatus.PENDING},
+        notification = (
+            Notification.objects.select_related("user")
+            .only(
+                "id",
+                "title",
+                "message",
+                *(f"user__{field}" for field in BACKEND_USER_FIELDS),
+            )
+            .get(id=notification_id)
         )
+    except Notification.DoesNotExist:
+        # Retrying can't make a deleted notification reappear
+        logger.error("Notification %s not found, skipping delivery", notification_id)
+        return
+
+    # Create or get delivery record
+    delivery, created = NotificationDelivery.objects.get_or_create(
+        notification=notification,
+        channel=channel,
+        defaults={"status": DeliveryStatus.PENDING},
+    )
 
-        # Update status to retrying if this is a retry
-        if not created and delivery.retry_count > 0:
-            delivery.status = DeliveryStatus.RETRYING
-            delivery.save()
+    deliveries = NotificationDelivery.objects.filter(pk=delivery.pk)
 
+    try:
         logger.info(
-            f"Attempting to deliver notification {notification_id} via {channel}"
+            "Attempting to deliver notification %s via %s", notification_id, channel
         )
         backend = get_notification_backend(channel)
 
-        # Attempt delivery
-        delivery.attempted_at = timezone.now()
-        delivery.save()
+        # Record the attempt, flagging it as a retry if an earlier one failed
+        now = timezone.now()
+        attempt = {"attempted_at": now, "updated_at": now}
+        if not created and delivery.retry_count > 0:
+            attempt["status"] = DeliveryStatus.RETRYING
+        deliveries.update(**attempt)
 
         success = backend.send_notification(notification)
 
         if success:
-            delivery.status = DeliveryStatus.SENT
-            delivery.delivered_at = timezone.now()
+            now = timezone.now()
+            deliveries.update(
+                status=DeliveryStatus.SENT, delivered_at=now, updated_at=now
+            )
             logger.info(
-                f"Successfully delivered notification {notification_id} via {channel}"
+                "Successfully delivered notification %s via %s",
+                notification_id,
+                channel,
             )
         else:
             raise Exception("Backend returned failure")
 
     except Exception as exc:
-        delivery.status = DeliveryStatus.FAILED
-        delivery.failed_at = timezone.now()
-        delivery.error_message = str(exc)
-        delivery.retry_count += 1
-        delivery.save()
+        # F() keeps the counter right if attempts for the row ever overlap
+        now = timezone.now()
+        deliveries.update(
+            status=DeliveryStatus.FAILED,
+            failed_at=now,
+            error_message=str(exc),
+            retry_count=F("retry_count") + 1,
+            updated_at=now,
+        )
+        retry_count = delivery.retry_count + 1
 
         logger.error(
-            f"Failed to deliver notification {notification_id} via {channel}: {exc}"
+            "Failed to deliver notification %s via %s: %s",
+            notification_id,
+            channel,
+            exc,
         )
 
         # Retry with exponential backoff
-        if delivery.retry_count < 3:
-            raise self.retry(exc=exc, countdown=60 * (2**delivery.retry_count))
+        if retry_count < 3:
+            raise self.retry(exc=exc, countdown=60 * (2**retry_count))
         else:
             logger.error(
-                f"Max retries exceeded for notification {notification_id} via {channel}"
+                "Max retries exceeded for notification %s via %s",
+                notification_id,
+                channel,
             )
-
-    finally:
-        delivery.save()
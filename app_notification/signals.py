@@ -1,7 +1,9 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
 from .services import NotificationService
+from .tasks import notify_comment_task
 from django.contrib.auth.signals import user_logged_in
 from authentication.models import UserDevice
 from django.dispatch import Signal
@@ -9,6 +11,12 @@ from django.dispatch import Signal
 jwt_logged_in = Signal()  # Custom signal for JWT login
 from django.utils import timezone
 from post.models import Comment
+from .cache import (
+    invalidate_event_type,
+    invalidate_templates,
+    invalidate_user_preferences,
+)
+from .models import EventType, NotificationPreference, NotificationTemplate
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,14 +31,15 @@ def create_user_notification_preferences(sender, instance, created, **kwargs):
     Automatically create notification preferences when a new user is created
     """
     if created:
-        NotificationService._get_user_preferences(instance)
+        transaction.on_commit(
+            lambda: NotificationService._get_user_preferences(instance)
+        )
 
 
 @receiver(jwt_logged_in)
 def track_device_on_login(sender, request, user, **kwargs):
 
     device_id = request.headers.get("Device-ID")
-    logger.info(f"******************* User Device id {device_id} *******************")
 
     if not device_id:
         return
@@ -38,31 +47,27 @@ def track_device_on_login(sender, request, user, **kwargs):
     try:
         existing_device = UserDevice.objects.get(user=user)
         if existing_device.device_id != device_id:
-            logger.info(
-                f"******************* Unrecognized Device login from {user}*******************"
-            )
-            print("Updating device ID for user:", user.username)
+            logger.info("Unrecognized device login for user %s", user.id)
             existing_device.device_id = device_id
-            existing_device.save()
-            NotificationService.dispatch_notification(
-                event_type_code="unrecognized_login",
-                context={
-                    "user_id": user.id,
-                    "timestamp": timezone.now().strftime("%Y-%m-%d %H:%M:%S"),
-                },
-                target_users=[user.id],
+            existing_device.save(update_fields=["device_id", "updated_at"])
+            context = {
+                "user_id": user.id,
+                "timestamp": timezone.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            transaction.on_commit(
+                lambda: NotificationService.dispatch_notification(
+                    event_type_code="unrecognized_login",
+                    context=context,
+                    target_users=[user.id],
+                )
             )
         else:
-            print("Device ID already exists for user:", user.username)
-            existing_device.save()
+            existing_device.save(update_fields=["updated_at"])
     except UserDevice.DoesNotExist:
-        logger.info(
-            f"*******************  Creating new device entry for user {user.username} *******************"
-        )
         UserDevice.objects.create(user=user, device_id=device_id)
 
     except Exception as e:
-        logger.error(f"Error tracking device on login: {e}", exc_info=True)
+        logger.error("Error tracking device on login: %s", e, exc_info=True)
         return
 
 
@@ -70,33 +75,28 @@ def track_device_on_login(sender, request, user, **kwargs):
 def notify_on_new_comment(sender, instance, created, **kwargs):
     if not created:
         return
-    post = instance.post
-    username = instance.author.username
-    user_ids = get_related_user_ids(post)
-    logger.info(f"Related user IDs for post {post.id}: {user_ids}")
-    if user_ids:
-        NotificationService.dispatch_notification(
-            event_type_code="new_comment",
-            context={"post_title": post.title, "username": username},
-            target_users=user_ids,
-        )
+    # Notify from a worker once the comment is committed, keeping the
+    # recipient lookup and dispatch out of the commenter's request
+    transaction.on_commit(lambda: notify_comment_task.delay(instance.id))
 
 
-def get_related_user_ids(post):
-    """
-    Returns a list of user IDs connected to a post:
-    - Post author
-    - All users who commented on the post
-    """
-    author_id = post.author_id
+# Entries are dropped once the write commits; dropping them earlier lets a
+# concurrent reader cache the old row again for the whole timeout
+
+
+@receiver([post_save, post_delete], sender=EventType)
+def clear_cached_event_type(sender, instance, **kwargs):
+    code = instance.code
+    transaction.on_commit(lambda: invalidate_event_type(code))
+
 
-    commenter_ids = (
-        post.comments.exclude(author_id=author_id)
-        .values_list("author_id", flat=True)
-        .distinct()
-    )
+@receiver([post_save, post_delete], sender=NotificationTemplate)
+def clear_cached_templates(sender, instance, **kwargs):
+    event_type_id = instance.event_type_id
+    transaction.on_commit(lambda: invalidate_templates(event_type_id))
 
-    related_user_ids = set(commenter_ids)
-    related_user_ids.add(author_id)
 
-    return list(related_user_ids)
+@receiver([post_save, post_delete], sender=NotificationPreference)
+def clear_cached_preferences(sender, instance, **kwargs):
+    user_id = instance.user_id
+    transaction.on_commit(lambda: invalidate_user_preferences(user_id))
@@ -1,8 +1,80 @@
 from celery import shared_task
+from django.contrib.auth import get_user_model
 from django.core.management import call_command
+from post.models import Comment
+from .models import EventType
+from .services import NotificationService
+
+User = get_user_model()
 
 
 @shared_task
 def send_weekly_summaries():
     # Replace 'my_command' with your actual management command name
     call_command("send_weekly_summaries")
+
+
+@shared_task
+def create_default_event_prefs_for_user(user_id):
+    """
+    Create a new user's default event preferences
+    """
+    user = User.objects.filter(id=user_id).first()
+    if user is not None:
+        NotificationService._create_default_event_preferences(user)
+
+
+@shared_task
+def create_default_prefs_for_event_type(event_type_id):
+    """
+    Create default preferences for every user missing one for an event type
+    """
+    event_type = EventType.objects.filter(id=event_type_id).first()
+    if event_type is not None:
+        NotificationService._create_default_preferences_for_event_type(event_type)
+
+
+@shared_task
+def notify_comment_task(comment_id):
+    """
+    Notify the users connected to a post about a new comment on it
+    """
+    comment = (
+        Comment.objects.select_related("post", "author").filter(id=comment_id).first()
+    )
+    if comment is None:
+        return
+
+    post = comment.post
+    user_ids = get_related_user_ids(post)
+    if user_ids:
+        NotificationService.dispatch_notification(
+            event_type_code="new_comment",
+            context={
+                "actor_id": comment.author_id,
+                "post_id": post.id,
+                "post_title": post.title,
+                "username": comment.author.username,
+            },
+            target_users=user_ids,
+        )
+
+
+def get_related_user_ids(post):
+    """
+    Returns a list of user IDs connected to a post:
+    - Post author
+    - All users who commented on the post
+    """
+    author_id = post.author_id
+
+    commenter_ids = (
+        post.comments.exclude(author_id=author_id)
+        .values_list("author_id", flat=True)
+        .distinct()
+    )
+
+    related_user_ids = set(commenter_ids)
+    related_user_ids.add(author_id)
+
+    return list(related_user_ids)
@@ -1,3 +1,64 @@
-from django.test import TestCase
+from types import SimpleNamespace
 
-# Create your tests here.
+from django.test import SimpleTestCase
+
+from .models import _compile_format
+
+
+class CompileFormatTests(SimpleTestCase):
+    """
+    Compiled templates must render exactly like str.format
+    """
+
+    def assertRendersLikeFormat(self, template, **context):
+        self.assertEqual(_compile_format(template)(context), template.format(**context))
+
+    def test_plain_fields(self):
+        self.assertRendersLikeFormat(
+            "Hi {username}, {count} new", username="ana", count=3
+        )
+
+    def test_no_fields(self):
+        self.assertRendersLikeFormat("Nothing to fill in")
+        self.assertRendersLikeFormat("")
+
+    def test_conversions(self):
+        self.assertRendersLikeFormat("{name!r} / {name!s} / {name!a}", name="café")
+        self.assertRendersLikeFormat("{value!r:>12}", value="x")
+
+    def test_format_specs(self):
+        self.assertRendersLikeFormat(
+            "{n:05d} {f:.2f} {s:^9}|", n=42, f=3.14159, s="mid"
+        )
+
+    def test_nested_format_spec(self):
+        self.assertRendersLikeFormat("[{x:{w}}]", x="ab", w=6)
+        self.assertRendersLikeFormat("[{x:>{w}.{p}f}]", x=2.5, w=8, p=1)
+
+    def test_attribute_and_index_fields(self):
+        self.assertRendersLikeFormat(
+            "{post.title} by {authors[0]} ({meta[key]})",
+            post=SimpleNamespace(title="Hello"),
+            authors=["ana", "ben"],
+            meta={"key": "v"},
+        )
+
+    def test_escaped_braces(self):
+        self.assertRendersLikeFormat("{{literal}} {value} }}{{", value=1)
+
+    def test_literal_with_quotes(self):
+        self.assertRendersLikeFormat("it's \"{value}\" \\n", value="q")
+
+    def test_missing_key_raises_same_error(self):
+        with self.assertRaises(KeyError) as expected:
+            "{missing}".format(present=1)
+        with self.assertRaises(KeyError) as actual:
+            _compile_format("{missing}")({"present": 1})
+        self.assertEqual(actual.exception.args, expected.exception.args)
+
+    def test_missing_attribute_key_raises_same_error(self):
+        with self.assertRaises(KeyError) as expected:
+            "{missing.attr}".format(present=1)
+        with self.assertRaises(KeyError) as actual:
+            _compile_format("{missing.attr}")({"present": 1})
+        self.assertEqual(actual.exception.args, expected.exception.args)
@@ -1,12 +1,12 @@
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework.pagination import PageNumberPagination
 from django_filters.rest_framework import DjangoFilterBackend
 from django.contrib.auth import get_user_model
 from django.utils import timezone
-from django.db.models import Q
-from .models import Notification, NotificationPreference, EventType, UserEventPreference
+from django.db import transaction
+from django.db.models import Q, prefetch_related_objects
+from .models import Notification, EventType, UserEventPreference
 from .serializers import (
     NotificationSerializer,
     NotificationListSerializer,
@@ -17,21 +17,20 @@ from .serializers import (
     UserEventPreferenceSerializer,
     UpdateEventPreferenceSerializer,
 )
-from .services import NotificationService
+from .services import BROADCAST_EVENT_CODES, NotificationService
+from .tasks import create_default_prefs_for_event_type
+from .cache import (
+    get_active_event_types,
+    get_active_event_types_by_code,
+    get_user_preferences,
+)
+from app_notification.pagination import NotificationCursorPagination
 from app_notification.permissions import IsOwnerOrReadOnly
 from drf_spectacular.utils import extend_schema
 
 User = get_user_model()
 
 
-class NotificationPagination(PageNumberPagination):
-    """Custom pagination for notifications"""
-
-    page_size = 20
-    page_size_query_param = "page_size"
-    max_page_size = 100
-
-
 @extend_schema(tags=["Notifications"])
 class UnreadNotificationsView(generics.ListAPIView):
     """
@@ -41,15 +40,15 @@ class UnreadNotificationsView(generics.ListAPIView):
 
     serializer_class = NotificationListSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = NotificationPagination
+    pagination_class = NotificationCursorPagination
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["event_type"]
 
     def get_queryset(self):
         return (
             Notification.objects.filter(user=self.request.user, is_read=False)
-            .select_related("event_type")
             .order_by("-created_at")
+            .values(*NotificationListSerializer.Meta.fields)
         )
 
 
@@ -62,15 +61,15 @@ class NotificationHistoryView(generics.ListAPIView):
 
     serializer_class = NotificationListSerializer
     permission_classes = [permissions.IsAuthenticated]
-    pagination_class = NotificationPagination
+    pagination_class = NotificationCursorPagination
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ["event_type", "is_read"]
+    filterset_fields = ["event_type", "is_read", "post_id"]
 
     def get_queryset(self):
         return (
             Notification.objects.filter(user=self.request.user)
-            .select_related("event_type")
             .order_by("-created_at")
+            .values(*NotificationListSerializer.Meta.fields)
         )
 
 
@@ -85,10 +84,8 @@ class NotificationDetailView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return (
+        return self.get_serializer_class().setup_eager_loading(
             Notification.objects.filter(user=self.request.user)
-            .select_related("event_type")
-            .prefetch_related("deliveries")
         )
 
 
@@ -128,19 +125,19 @@ class NotificationPreferencesView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        preferences, created = NotificationPreference.objects.get_or_create(
-            user=self.request.user,
-            defaults={
-                "in_app_enabled": True,
-                "email_enabled": True,
-                "sms_enabled": False,
-            },
+        user = self.request.user
+        preferences = get_user_preferences(user.id)
+
+        # Create preferences with default event preferences if user is new
+        if preferences is None:
+            preferences = NotificationService._get_user_preferences(user)
+
+        # The request already holds the user; only the nested event
+        # preferences are left to load
+        preferences.user = user
+        prefetch_related_objects(
+            [preferences], self.get_serializer_class().event_preferences_prefetch()
         )
-
-        # Create default event preferences if user is new
-        if created:
-            NotificationService._create_default_event_preferences(self.request.user)
-
         return preferences
 
 
@@ -155,6 +152,12 @@ class EventTypesView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
+        # The plain listing is served from the cached list, dropped by the
+        # EventType signals on any change. Ordering, search and filter
+        # parameters are applied by the default backends, which need a
+        # QuerySet
+        if not self.request.query_params:
+            return get_active_event_types()
         return EventType.objects.filter(is_active=True).order_by("name")
 
     def get_permissions(self):
@@ -192,25 +195,65 @@ def update_event_preferences(request):
     """
     serializer = UpdateEventPreferenceSerializer(data=request.data)
 
-    if serializer.is_valid():
-        preferences_data = serializer.validated_data["preferences"]
-        updated_preferences = NotificationService.update_user_event_preferences(
-            request.user, preferences_data
-        )
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-        response_serializer = UserEventPreferenceSerializer(
-            updated_preferences, many=True
-        )
+    preferences_data = serializer.validated_data["preferences"]
 
+    # Resolve every requested event type from the cached active list
+    event_types = get_active_event_types_by_code()
+    invalid_codes = [
+        pref["event_type_code"]
+        for pref in preferences_data
+        if pref["event_type_code"] not in event_types
+    ]
+    if invalid_codes:
         return Response(
             {
-                "message": f"Updated {len(updated_preferences)} event preferences",
-                "preferences": response_serializer.data,
+                "preferences": [
+                    f"Event type '{code}' does not exist or is inactive"
+                    for code in invalid_codes
+                ]
             },
-            status=status.HTTP_200_OK,
+            status=status.HTTP_400_BAD_REQUEST,
         )
 
-    return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    updated_preferences = NotificationService.update_user_event_preferences(
+        request.user,
+        [
+            {
+                "event_type": event_types[pref["event_type_code"]],
+                "is_enabled": pref["is_enabled"],
+            }
+            for pref in preferences_data
+        ],
+    )
+
+    # Same shape as UserEventPreferenceSerializer, built straight from the
+    # upserted rows rather than through per-field serializer dispatch
+    event_type_data = {
+        preference.event_type_id: {
+            field: getattr(preference.event_type, field)
+            for field in EventTypeSerializer.Meta.fields
+        }
+        for preference in updated_preferences
+    }
+    preferences = [
+        {
+            "event_type": event_type_data[preference.event_type_id],
+            "is_enabled": preference.is_enabled,
+            "updated_at": preference.updated_at,
+        }
+        for preference in updated_preferences
+    ]
+
+    return Response(
+        {
+            "message": f"Updated {len(preferences)} event preferences",
+            "preferences": preferences,
+        },
+        status=status.HTTP_200_OK,
+    )
 
 
 @extend_schema(tags=["Event Management"])
@@ -232,15 +275,27 @@ def trigger_notification_event(request):
         if "user_id" not in payload:
             payload["user_id"] = request.user.id
 
-        notifications = NotificationService.dispatch_notification(
+        notification_ids = NotificationService.dispatch_notification(
             event_type_code=event_type_code, context=payload, target_users=target_users
         )
 
+        # Untargeted broadcasts are fanned out to shard tasks, so nothing
+        # has been created yet when dispatch returns
+        if target_users is None and event_type_code in BROADCAST_EVENT_CODES:
+            return Response(
+                {
+                    "message": f"Queued {event_type_code} broadcast",
+                    "queued": True,
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
+
         return Response(
             {
                 "message": f"Triggered {event_type_code} event",
-                "notifications_created": len(notifications),
-                "notification_ids": [n.id for n in notifications],
+                "queued": False,
+                "notifications_created": len(notification_ids),
+                "notification_ids": notification_ids,
             },
             status=status.HTTP_201_CREATED,
         )
@@ -260,5 +315,7 @@ class CreateEventTypeView(generics.CreateAPIView):
 
     def perform_create(self, serializer):
         event_type = serializer.save()
-        # Create default preferences for all existing users
-        NotificationService._create_default_preferences_for_event_type(event_type)
+        # Create default preferences for all existing users in the background
+        transaction.on_commit(
+            lambda: create_default_prefs_for_event_type.delay(event_type.id)
+        )
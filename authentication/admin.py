@@ -23,8 +23,10 @@ admin.site.register(User, UserAdmin)
 class UserDeviceAdmin(admin.ModelAdmin):
     list_display = ("user", "device_id", "device_name", "updated_at", "created_at")
     search_fields = ("user__username", "device_id", "device_name")
-    list_filter = ("user",)
     ordering = ("-created_at",)
+    list_select_related = ("user",)
+    # A select widget (or a per-user filter) would load every user
+    raw_id_fields = ("user",)
 
 
 admin.site.register(UserDevice, UserDeviceAdmin)
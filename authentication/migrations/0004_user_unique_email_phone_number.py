@@ -0,0 +1,26 @@
+# Generated by Django 5.2.4 on 2026-10-15 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("authentication", "0003_alter_user_phone_number"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="phone_number",
+            field=models.CharField(blank=True, max_length=10, null=True, unique=True),
+        ),
+        migrations.AddConstraint(
+            model_name="user",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("email", ""), _negated=True),
+                fields=("email",),
+                name="uniq_user_email",
+            ),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 
@@ -7,7 +8,8 @@ class User(AbstractUser):
     Extended User model for additional fields
     """
 
-    phone_number = models.CharField(max_length=10, blank=True, null=True)
+    # NULLs don't collide, so users without a number stay unconstrained
+    phone_number = models.CharField(max_length=10, blank=True, null=True, unique=True)
     is_verified = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -16,6 +18,12 @@ class User(AbstractUser):
         db_table = "users"
         verbose_name = "User"
         verbose_name_plural = "Users"
+        constraints = [
+            # Accounts created without an email (e.g. createsuperuser) keep ""
+            models.UniqueConstraint(
+                fields=["email"], condition=~models.Q(email=""), name="uniq_user_email"
+            ),
+        ]
 
 
 class UserDevice(models.Model):
@@ -23,7 +31,9 @@ class UserDevice(models.Model):
     Model to track user devices
     """
 
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="devices")
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="devices"
+    )
     device_id = models.CharField(max_length=255)
     device_name = models.CharField(max_length=100, blank=True, null=True)
     updated_at = models.DateTimeField(auto_now=True)
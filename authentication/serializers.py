@@ -1,5 +1,7 @@
 # api/serializers.py
 from .models import User
+from django.db import IntegrityError
+from django.db.models import Q
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from app_notification.signals import jwt_logged_in
@@ -8,6 +10,12 @@ import re
 
 logger = logging.getLogger(__name__)
 
+_PHONE_RE = re.compile(r"9[6-9]\d{8}")
+_UPPER_RE = re.compile(r"[A-Z]")
+_LOWER_RE = re.compile(r"[a-z]")
+_DIGIT_RE = re.compile(r"\d")
+_SPECIAL_RE = re.compile(r"[^\w\s]")
+
 
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, min_length=8)
@@ -17,41 +25,63 @@ class RegisterSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ("username", "email", "password", "phone_number")
-
-    def validate_email(self, value):
-        """Ensure email is unique"""
-        if User.objects.filter(email=value).exists():
-            raise serializers.ValidationError("Email is already in use.")
-        return value
+        # Uniqueness is checked in one query by validate() rather than by a
+        # validator query per unique field or constraint
+        extra_kwargs = {
+            "email": {"validators": []},
+            "phone_number": {"validators": []},
+        }
+        validators = []
 
     def validate_phone_number(self, value):
         """Validate Nepali phone number format (length 10, starts with 98/97/96 etc.)"""
-        if not re.fullmatch(r"9[6-9]\d{8}", value):
+        if not _PHONE_RE.fullmatch(value):
             raise serializers.ValidationError("Enter a valid 10-digit Nepali phone number.")
-        if User.objects.filter(phone_number=value).exists():
-            raise serializers.ValidationError("Phone number is already registered.")
         return value
 
     def validate_password(self, value):
         """Ensure password is strong enough"""
-        if not re.search(r"[A-Z]", value):
+        if not _UPPER_RE.search(value):
             raise serializers.ValidationError("Password must contain at least one uppercase letter.")
-        if not re.search(r"[a-z]", value):
+        if not _LOWER_RE.search(value):
             raise serializers.ValidationError("Password must contain at least one lowercase letter.")
-        if not re.search(r"\d", value):
+        if not _DIGIT_RE.search(value):
             raise serializers.ValidationError("Password must contain at least one number.")
-        if not re.search(r"[^\w\s]", value):
+        if not _SPECIAL_RE.search(value):
             raise serializers.ValidationError("Password must contain at least one special character.")
         return value
 
+    def validate(self, attrs):
+        """Ensure email and phone number are unique, checking both in one query"""
+        email, phone_number = attrs["email"], attrs["phone_number"]
+        errors = {}
+        taken = User.objects.filter(
+            Q(email=email) | Q(phone_number=phone_number)
+        ).values_list("email", "phone_number")
+        for existing_email, existing_phone_number in taken:
+            if existing_email == email:
+                errors["email"] = "Email is already in use."
+            if existing_phone_number == phone_number:
+                errors["phone_number"] = "Phone number is already registered."
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
     def create(self, validated_data):
-        user = User.objects.create_user(
-            username=validated_data["username"],
-            email=validated_data["email"],
-            password=validated_data["password"],
-            phone_number=validated_data["phone_number"],
-        )
-        logger.info(f"User created successfully: {user.username}")
+        try:
+            user = User.objects.create_user(
+                username=validated_data["username"],
+                email=validated_data["email"],
+                password=validated_data["password"],
+                phone_number=validated_data["phone_number"],
+            )
+        except IntegrityError:
+            # A concurrent registration took the email or phone number
+            # after validate() checked them
+            raise serializers.ValidationError(
+                "Email or phone number is already registered."
+            )
+        logger.info("User created: %s", user.username)
         return user
 
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
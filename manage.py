@@ -15,6 +15,9 @@ def main():
             "available on your PYTHONPATH environment variable? Did you "
             "forget to activate a virtual environment?"
         ) from exc
+    from notification.log_listener import start_log_listener
+
+    start_log_listener()
     execute_from_command_line(sys.argv)
 
 
@@ -11,6 +11,10 @@ import os
 
 from django.core.asgi import get_asgi_application
 
+from notification.log_listener import start_log_listener
+
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'notification.settings')
 
 application = get_asgi_application()
+
+start_log_listener()
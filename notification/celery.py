@@ -1,6 +1,12 @@
 import os
 from celery import Celery
-from celery.signals import setup_logging
+from celery.signals import (
+    setup_logging,
+    worker_process_init,
+    worker_process_shutdown,
+)
+
+from notification.log_listener import start_log_listener, stop_log_listener
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "notification.settings")
 
@@ -19,4 +25,16 @@ def debug_task(self):
 def config_loggers(*args, **kwargs):
     from logging.config import dictConfig
     from django.conf import settings
-    dictConfig(settings.LOGGING)
\ No newline at end of file
+    dictConfig(settings.LOGGING)
+    start_log_listener()
+
+
+@worker_process_init.connect
+def start_pool_process_logging(*args, **kwargs):
+    start_log_listener()
+
+
+@worker_process_shutdown.connect
+def stop_pool_process_logging(*args, **kwargs):
+    # Pool processes leave through os._exit, which skips atexit
+    stop_log_listener()
@@ -0,0 +1,107 @@
+"""
+Queue-based logging for the project.
+
+The handlers configured in settings.LOGGING only put records on LOG_QUEUE;
+a listener thread does the formatting and the console/file writes, keeping
+that I/O off request and task threads. Each process entrypoint (manage.py,
+the WSGI/ASGI modules and the Celery worker signals) starts its own listener,
+and processes forked from one that was running get theirs restarted.
+"""
+
+import atexit
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_QUEUE = queue.Queue(-1)
+
+_handlers = None
+_listener = None
+_listener_pid = None
+_restart_after_fork = False
+
+
+def _get_handlers():
+    global _handlers
+    if _handlers is None:
+        from django.conf import settings
+
+        formatter = logging.Formatter(
+            "[{asctime}] {levelname} {name} — {message}", style="{"
+        )
+        settings.LOG_DIR.mkdir(exist_ok=True)
+        console_handler = logging.StreamHandler()
+        file_handler = RotatingFileHandler(
+            settings.LOG_DIR / "django.log",
+            maxBytes=1024 * 1024 * 5,  # 5 MB
+            backupCount=5,
+        )
+        for handler in (console_handler, file_handler):
+            handler.setFormatter(formatter)
+        _handlers = (console_handler, file_handler)
+    return _handlers
+
+
+def _listener_is_current():
+    # A listener started before a fork belongs to the parent; its thread
+    # doesn't exist in the child
+    return _listener is not None and _listener_pid == os.getpid()
+
+
+def start_log_listener():
+    """
+    Start this process's listener thread, if it isn't running already
+    """
+    global _listener, _listener_pid
+    if not _listener_is_current():
+        _listener = QueueListener(
+            LOG_QUEUE, *_get_handlers(), respect_handler_level=True
+        )
+        _listener.start()
+        _listener_pid = os.getpid()
+
+
+def stop_log_listener():
+    """
+    Write out every queued record and stop the listener thread
+    """
+    global _listener
+    if _listener_is_current():
+        _listener.stop()
+    _listener = None
+
+
+class ListenerQueueHandler(QueueHandler):
+    """
+    QueueHandler that restarts the listener in processes forked without the
+    Python fork hooks (e.g. uWSGI workers), which would otherwise only fill
+    the queue
+    """
+
+    def enqueue(self, record):
+        if _listener is not None and _listener_pid != os.getpid():
+            start_log_listener()
+        super().enqueue(record)
+
+
+def _before_fork():
+    # Drain the queue and join the thread first, so a child neither
+    # re-emits the parent's pending records nor forks with the thread live
+    global _restart_after_fork
+    _restart_after_fork = _listener_is_current()
+    stop_log_listener()
+
+
+def _after_fork():
+    # Runs in both the parent and the child; each gets its own listener
+    if _restart_after_fork:
+        start_log_listener()
+
+
+atexit.register(stop_log_listener)
+# Windows has no fork
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(
+        before=_before_fork, after_in_parent=_after_fork, after_in_child=_after_fork
+    )
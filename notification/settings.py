@@ -9,10 +9,12 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # Quick-start development settings - unsuitable for production
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = "django-insecure-&81xs5h*0nz*((rio9fr1ocle-%xv*)%7-#k91ve6*k_8=_l=$"
+SECRET_KEY = config("SECRET_KEY")
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = config("DEBUG", default=True, cast=bool)
+# Besides leaking tracebacks, DEBUG keeps every executed query in
+# connection.queries, which grows without bound in long-running processes
+DEBUG = config("DEBUG", default=False, cast=bool)
 
 ALLOWED_HOSTS = config(
     "ALLOWED_HOSTS",
@@ -22,51 +24,42 @@ ALLOWED_HOSTS = config(
 
 
 LOG_LEVEL = config("LOG_LEVEL", default="INFO")
+LOG_DIR = BASE_DIR / "logs"
 
+# Loggers only enqueue records; the listener started by each process
+# entrypoint (see notification.log_listener) writes them to the console and
+# LOG_DIR/django.log
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
-    "formatters": {
-        "standard": {
-            "format": "[{asctime}] {levelname} {name} — {message}",
-            "style": "{",
-        },
-    },
     "handlers": {
-        "console": {
-            "class": "logging.StreamHandler",
-            "formatter": "standard",
-        },
-        "file": {
-            "class": "logging.handlers.RotatingFileHandler",
-            "filename": os.path.join(BASE_DIR, "logs", "django.log"),
-            "maxBytes": 1024 * 1024 * 5,  # 5 MB
-            "backupCount": 5,
-            "formatter": "standard",
+        "queue": {
+            "()": "notification.log_listener.ListenerQueueHandler",
+            "queue": "ext://notification.log_listener.LOG_QUEUE",
         },
     },
     "root": {
-        "handlers": ["console", "file"],
+        "handlers": ["queue"],
         "level": LOG_LEVEL,
     },
     "loggers": {
         "django": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": LOG_LEVEL,
             "propagate": False,
         },
         "app_notification": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": LOG_LEVEL,
             "propagate": False,
         },
         "authentication": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": LOG_LEVEL,
             "propagate": False,
         },
         "post": {
-            "handlers": ["console", "file"],
+            "handlers": ["queue"],
             "level": LOG_LEVEL,
             "propagate": False,
         },
@@ -129,10 +122,23 @@ WSGI_APPLICATION = "notification.wsgi.application"
 
 # Database
 
+# SQLite by default for local development; set DB_ENGINE to
+# django.db.backends.postgresql (and the DB_* values) for real deployments
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "ENGINE": config("DB_ENGINE", default="django.db.backends.sqlite3"),
+        "NAME": config("DB_NAME", default=str(BASE_DIR / "db.sqlite3")),
+        "USER": config("DB_USER", default=""),
+        "PASSWORD": config("DB_PASSWORD", default=""),
+        "HOST": config("DB_HOST", default=""),
+        "PORT": config("DB_PORT", default=""),
+        # Reuse connections across requests instead of reconnecting each time
+        "CONN_MAX_AGE": config("DB_CONN_MAX_AGE", default=60, cast=int),
+        "CONN_HEALTH_CHECKS": True,
+        # Needed when connecting through pgbouncer in transaction pooling mode
+        "DISABLE_SERVER_SIDE_CURSORS": config(
+            "DB_DISABLE_SERVER_SIDE_CURSORS", default=False, cast=bool
+        ),
     }
 }
 
@@ -233,6 +239,15 @@ SPECTACULAR_SETTINGS = {
     "VERSION": "1.0.0",
 }
 
+# Cache (Redis, shared by the web and Celery processes)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": config("REDIS_URL", default="redis://localhost:6379/0"),
+        "KEY_PREFIX": "notification",
+    }
+}
+
 # Celery Configuration
 CELERY_BROKER_URL = config("REDIS_URL", default="redis://localhost:6379/0")
 CELERY_RESULT_BACKEND = config("REDIS_URL", default="redis://localhost:6379/0")
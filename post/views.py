@@ -2,15 +2,7 @@ from rest_framework import generics, permissions
 from .models import Post, Comment
 from .serializers import PostSerializer, CommentSerializer
 from drf_spectacular.utils import extend_schema
-from rest_framework.pagination import PageNumberPagination
-
-
-class NotificationPagination(PageNumberPagination):
-    """Custom pagination for notifications"""
-
-    page_size = 20
-    page_size_query_param = "page_size"
-    max_page_size = 100
+from app_notification.pagination import NotificationCursorPagination
 
 
 class IsAuthorOrReadOnly(permissions.BasePermission):
@@ -27,7 +19,7 @@ class PostListCreateView(generics.ListCreateAPIView):
     queryset = Post.objects.all().order_by("-created_at")
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    pagination_class = NotificationPagination
+    pagination_class = NotificationCursorPagination
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)